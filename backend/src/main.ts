@@ -31,6 +31,8 @@ let lspHeader: string | null = null;
 
 let decorationsCollection: monaco.editor.IEditorDecorationsCollection | null = null;
 
+let pendingText: { meta: any; chunks: string[] } | null = null;
+
 // Define init function
 function init() {
   // Add any initialization code here if needed
@@ -82,50 +84,92 @@ function sendToPython(name: string, value: any) {
   }
 }
 
+function setText(data: any) {
+  const model = editor.getModel();
+  if (model) {
+    // Only create a new model if the URI or language is changing
+    if (
+      (data.uri && model.uri.toString() !== monaco.Uri.parse(data.uri).toString()) ||
+      (data.language && model.getLanguageId() !== data.language)
+    ) {
+      // If the URI or language is changing, dispose the old model
+      model.dispose();
+      let language = data.language ?? undefined;
+      let uri = data.uri ? monaco.Uri.parse(data.uri) : undefined;
+
+      const new_model = monaco.editor.createModel(data.data, language, uri);
+      editor.setModel(new_model);
+      sendToPython("_current_uri", new_model.uri.toString());
+      if (!data.language) {
+        // Only report languages inferred from the URI; requested ones are already known to Python
+        sendToPython("_current_language", new_model.getLanguageId());
+      }
+      return;
+    }
+    // If no new language or uri is specified, just update the text
+    model.pushEditOperations(
+      [],
+      [
+        {
+          range: model.getFullModelRange(),
+          text: data.data,
+        },
+      ],
+      () => null
+    );
+    return;
+  } else {
+    // If no model exists, create a new one
+    let language = data.language ?? undefined;
+    let uri = data.uri ? monaco.Uri.parse(data.uri) : undefined;
+
+    const new_model = monaco.editor.createModel(data.data, language, uri);
+    editor.setModel(new_model);
+    sendToPython("_current_uri", new_model.uri.toString());
+    if (!data.language) {
+      sendToPython("_current_language", new_model.getLanguageId());
+    }
+  }
+}
+
 function updateFromPython(name: string, value: string) {
   const data = JSON.parse(value);
+  if (name === "_batch") {
+    // Python coalesces consecutive updates into a single message of [name, data] pairs
+    for (const [entryName, entryData] of data) {
+      handleUpdate(entryName, entryData);
+    }
+    return;
+  }
+  handleUpdate(name, data);
+}
+
+function handleUpdate(name: string, data: any) {
   console.log(`Received update from Python: ${name} =`, data);
   const model = editor.getModel();
   switch (name) {
     case "set_text":
-      if (model) {
-        // Only create a new model if the URI or language is changing
-        if (
-          (data.uri && model.uri.toString() !== monaco.Uri.parse(data.uri).toString()) ||
-          (data.language && model.getLanguageId() !== data.language)
-        ) {
-          // If the URI or language is changing, dispose the old model
-          model.dispose();
-          let language = data.language ?? undefined;
-          let uri = data.uri ? monaco.Uri.parse(data.uri) : undefined;
+      setText(data);
+      break;
 
-          const new_model = monaco.editor.createModel(data.data, language, uri);
-          editor.setModel(new_model);
-          sendToPython("_current_uri", new_model.uri.toString());
-          break;
-        }
-        // If no new language or uri is specified, just update the text
-        model.pushEditOperations(
-          [],
-          [
-            {
-              range: model.getFullModelRange(),
-              text: data.data,
-            },
-          ],
-          () => null
-        );
-        break;
-      } else {
-        // If no model exists, create a new one
-        let language = data.language ?? undefined;
-        let uri = data.uri ? monaco.Uri.parse(data.uri) : undefined;
+    case "set_text_begin":
+      // Large documents are sent in chunks; collect them and apply the text once at the end
+      pendingText = { meta: data, chunks: [] };
+      break;
 
-        const new_model = monaco.editor.createModel(data.data, language, uri);
-        editor.setModel(new_model);
-        sendToPython("_current_uri", new_model.uri.toString());
-        break;
+    case "set_text_chunk":
+      if (pendingText) {
+        pendingText.chunks.push(data);
+      }
+      break;
+
+    case "set_text_end":
+      if (pendingText) {
+        const { meta, chunks } = pendingText;
+        pendingText = null;
+        setText({ ...meta, data: chunks.join("") });
       }
+      break;
 
     case "read":
       // Readout the current value from the editor
@@ -140,11 +184,11 @@ function updateFromPython(name: string, value: string) {
 
     case "set_cursor": {
       // Set the cursor position in the editor
-      const position = data; // Assuming data is an object with line and column properties
+      const [line, col, moveTo] = data; // Sent as [line, column, moveToPosition]
       if (model) {
-        const lineNumber = position.line || 1; // Default to line 1 if not provided
-        const column = position.column || 1; // Default to column 1 if not provided
-        const moveToPosition = position.moveToPosition || ""; // Optional moveToPosition flag
+        const lineNumber = line || 1; // Default to line 1 if not provided
+        const column = col || 1; // Default to column 1 if not provided
+        const moveToPosition = moveTo || ""; // Optional moveToPosition flag
         const newPosition = new monaco.Position(lineNumber, column);
         const newSelection = new monaco.Selection(lineNumber, column, lineNumber, column);
         editor.setPosition(newPosition);
@@ -210,17 +254,18 @@ function updateFromPython(name: string, value: string) {
       }
       break;
     case "insert":
-      // Insert text at the specified position
+      // Insert text at the specified position, sent as [text, line, column]
       if (!model) break;
+      const [text, line, column] = data;
       let position = null;
-      if (data.line !== null) {
-        position = new monaco.Position(data.line, data.column || 1);
+      if (line !== null) {
+        position = new monaco.Position(line, column || 1);
       } else {
         position = editor.getPosition(); // Use current cursor position if no line is specified
       }
 
       if (position) {
-        const insertText = data.text || ""; // Default to empty string if no text provided
+        const insertText = text || ""; // Default to empty string if no text provided
         const editOperation = {
           range: new monaco.Range(position.lineNumber, position.column, position.lineNumber, position.column),
           text: insertText,
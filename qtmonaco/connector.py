@@ -1,5 +1,6 @@
 import json
 
+import orjson
 from qtpy.QtCore import QObject, Signal, Slot
 
 
@@ -25,25 +26,53 @@ class Connector(QObject):
         Process the buffer of data that was sent before the bridge was initialized.
         This is useful for sending initial data to the JavaScript side.
         """
-        for name, value in self._buffer:
-            self.send(name, value)
+        for name, data in self._buffer:
+            self.send_encoded(name, data)
         self._buffer.clear()
 
         # Update the local buffer by reading the current state
         # This is mostly to ensure that we are in sync with the JS side
         self.send("read", "")
 
+    @staticmethod
+    def encode(value) -> str:
+        """
+        Serialize a value to JSON for the JavaScript side.
+        Args:
+            value (any): The value to serialize.
+
+        Returns:
+            str: The JSON representation of the value.
+
+        Raises:
+            TypeError: If the value cannot be serialized to JSON.
+        """
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson rejects some values json accepts, e.g. lone surrogates or ints wider than 64 bit
+            return json.dumps(value)
+
     def send(self, name, value):
         """
         Send data to the JavaScript side.
+        The value is serialized immediately, so serialization errors are raised to the caller.
         Args:
             name (str): The name of the data to send.
             value (any): The value to send, which will be serialized to JSON.
         """
+        self.send_encoded(name, self.encode(value))
+
+    def send_encoded(self, name: str, data: str):
+        """
+        Send already serialized data to the JavaScript side.
+        Args:
+            name (str): The name of the data to send.
+            data (str): The JSON string to send.
+        """
         if not self._initialized:
-            self._buffer.append((name, value))
+            self._buffer.append((name, data))
             return
-        data = json.dumps(value)
         self.javascript_data_sent.emit(name, data)
 
     @Slot(str, str)
@@ -1,7 +1,7 @@
-import json
 from typing import Literal
 
-from qtpy.QtCore import Signal
+import orjson
+from qtpy.QtCore import QTimer, Signal
 from qtpy.QtWebChannel import QWebChannel
 from qtpy.QtWebEngineWidgets import QWebEngineView
 
@@ -9,6 +9,9 @@ from qtmonaco.connector import Connector
 from qtmonaco.monaco_page import MonacoPage
 from qtmonaco.resource_loader import get_monaco_base_url, get_monaco_html
 
+# Documents larger than this are sent to the JavaScript side in chunks of this size
+TEXT_CHUNK_SIZE = 64 * 1024
+
 
 def get_pylsp_host() -> str:
     """
@@ -40,19 +43,37 @@ class Monaco(QWebEngineView):
     def __init__(self, parent=None):
         super().__init__(parent=parent)
 
-        self.pylsp_host = get_pylsp_host()
+        self.pylsp_host = None
         self._connector = Connector(parent=self)
         self._value = ""
-        self._language = ""
+        self._language = "python"  # default language of the JS editor
         self._theme = ""
         self._readonly = False
+        self._minimap_enabled = True
+        self._vim_mode_enabled = False
         self._current_cursor = {"line": 1, "column": 1}
         self._initialized = False
         self._lsp_header = ""
         self._buffer = []
+        self._flush_scheduled = False
         self._lsp_buffer = []
         self._current_uri = None
 
+        # Handlers for the messages sent by the JavaScript side
+        self._dispatch = {
+            "bridge_initialized": lambda value: setattr(self, "bridge_initialized", value),
+            "on_value_changed": self.on_value_changed,
+            "_current_text": self._current_text,
+            "_current_uri": lambda value: setattr(self, "_current_uri", value),
+            "_current_language": self._current_language,
+            "_current_cursor": lambda value: setattr(self, "_current_cursor", value),
+            "_theme": lambda value: setattr(self, "_theme", value),
+            "_lsp_header": lambda value: setattr(self, "_lsp_header", value),
+            "_context_menu_action": self._context_menu_action,
+            "_signature_help": self._signature_help,
+            "_workspace_config_updated": self._workspace_config_updated,
+        }
+
         page = MonacoPage(parent=self)
         self.setPage(page)
 
@@ -61,7 +82,8 @@ class Monaco(QWebEngineView):
         self._channel.registerObject("connector", self._connector)
         self._connector.javascript_data_received.connect(self.on_new_data_received)
 
-        self.initialized.connect(lambda: self._set_host(self.pylsp_host))
+        self.initialized.connect(self._on_bridge_initialized)
+        self.language_changed.connect(self._maybe_start_lsp)
         self._load_editor()
 
     @property
@@ -80,33 +102,99 @@ class Monaco(QWebEngineView):
         base_url = get_monaco_base_url()
         self.setHtml(raw_html, base_url)
 
+    def _enqueue(self, name: str, value):
+        """
+        Queue a message for the JavaScript side.
+        Messages queued within the same event loop iteration are sent as a single batch.
+        The value is serialized right away, so serialization errors are raised to the caller.
+
+        Args:
+            name (str): The name of the data to send.
+            value (any): The value to send.
+        """
+        self._enqueue_encoded(name, Connector.encode(value))
+
+    def _enqueue_encoded(self, name: str, data: str):
+        """
+        Queue an already serialized message for the JavaScript side.
+
+        Args:
+            name (str): The name of the data to send.
+            data (str): The JSON string to send.
+        """
+        self._buffer.append((name, data))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._flush)
+
+    def _flush(self):
+        """Send all queued messages to the JavaScript side in a single batch."""
+        self._flush_scheduled = False
+        if not self._buffer:
+            return
+        batch = self._buffer
+        self._buffer = []
+        entries = ",".join(f'["{name}",{data}]' for name, data in batch)
+        self._connector.send_encoded("_batch", f"[{entries}]")
+
+    def _send_text_chunked(self, value: str, language: str | None, uri: str | None):
+        """
+        Send a large document to the JavaScript side in chunks.
+        Pending updates are flushed first so that the chunks keep their order relative to them.
+
+        Args:
+            value (str): The document to send.
+            language (str | None): The language of the document.
+            uri (str | None): The URI of the document.
+        """
+        self._flush()
+        self._connector.send("set_text_begin", {"language": language, "uri": uri})
+        for start in range(0, len(value), TEXT_CHUNK_SIZE):
+            self._connector.send("set_text_chunk", value[start : start + TEXT_CHUNK_SIZE])
+        self._connector.send("set_text_end", None)
+
+    def _on_bridge_initialized(self):
+        """
+        Start the PyLSP server if the editor uses Python and send the LSP messages
+        queued before the bridge was initialized.
+        """
+        self._maybe_start_lsp(self._language)
+        for name, data in self._lsp_buffer:
+            self._enqueue_encoded(name, data)
+        self._lsp_buffer.clear()
+
+    def _maybe_start_lsp(self, language: str):
+        """
+        Start the PyLSP server the first time the editor uses Python.
+        Editors that never use Python do not spawn the server at all.
+
+        Args:
+            language (str): The language the editor was switched to.
+        """
+        if self.pylsp_host is not None or language != "python":
+            return
+        self.pylsp_host = get_pylsp_host()
+        self._set_host(self.pylsp_host)
+
     def _set_host(self, host: str):
         """
-        Set the LSP host once the bridge is initialized.
+        Set the LSP host.
 
         Args:
             host (str): The host URL for the editor.
         """
-        self._connector.send("lsp_url", host)
-        for name, value in self._lsp_buffer:
-            self._connector.send(name, value)
+        self._enqueue("lsp_url", host)
 
     def on_new_data_received(self, name: str, value: str):
         """
         Handle new data received from JavaScript.
         This method is called when the JavaScript side sends data to the Python side.
         """
-        data = json.loads(value)
-        if hasattr(self, name):
-            method = getattr(self, name)
-            if callable(method):
-                method(data)
-                return
-            if hasattr(self, name):
-                setattr(self, name, data)
-                return
-        else:
-            print(f"Warning: No method or property named '{name}' in EditorBridge.")
+        handler = self._dispatch.get(name)
+        if handler is None:
+            print(f"Warning: No handler for '{name}' in EditorBridge.")
+            return
+        handler(orjson.loads(value))
 
     def on_value_changed(self, value):
         """Handle value changes from the JavaScript side."""
@@ -118,6 +206,13 @@ class Monaco(QWebEngineView):
         self._value = value
         self.text_changed.emit(value)
 
+    def _current_language(self, language: str):
+        """Handle the language of a newly created model reported by the JavaScript side."""
+        if self._language == language:
+            return
+        self._language = language
+        self.language_changed.emit(language)
+
     def _context_menu_action(self, value):
         if not isinstance(value, dict) or "id" not in value:
             return
@@ -151,11 +246,18 @@ class Monaco(QWebEngineView):
             return
         if self._readonly:
             raise ValueError("Editor is in read-only mode, cannot set value.")
-        if not isinstance(value, str):
-            raise TypeError("Value must be a string.")
+        if __debug__:
+            if not isinstance(value, str):
+                raise TypeError("Value must be a string.")
+        if language is not None and self._language != language:
+            self._language = language
+            self.language_changed.emit(language)
         self._value = value
-        data = {"data": value, "language": language, "uri": uri}
-        self._connector.send("set_text", data)
+        if len(value) > TEXT_CHUNK_SIZE:
+            self._send_text_chunked(value, language, uri)
+        else:
+            data = {"data": value, "language": language, "uri": uri}
+            self._enqueue("set_text", data)
         self.text_changed.emit(value)
 
     def get_text(self):
@@ -176,13 +278,14 @@ class Monaco(QWebEngineView):
         """
         if self._readonly:
             raise ValueError("Editor is in read-only mode, cannot insert text.")
-        if not isinstance(text, str):
-            raise TypeError("Text must be a string.")
+        if __debug__:
+            if not isinstance(text, str):
+                raise TypeError("Text must be a string.")
         if line is not None and column is None:
             column = 1  # Default to column 1 if not provided
         elif column is not None and line is None:
             raise ValueError("Column must be provided if line is specified.")
-        self._connector.send("insert", {"text": text, "line": line, "column": column})
+        self._enqueue("insert", (text, line, column))
 
     def delete_line(self, line: int | None = None):
         """
@@ -193,14 +296,16 @@ class Monaco(QWebEngineView):
         """
         if self._readonly:
             raise ValueError("Editor is in read-only mode, cannot delete line.")
-        self._connector.send("delete_line", line if line is not None else "current")
+        self._enqueue("delete_line", line if line is not None else "current")
 
     def get_language(self):
         return self._language
 
     def set_language(self, language):
+        if self._language == language:
+            return
         self._language = language
-        self._connector.send("language", language)
+        self._enqueue("language", language)
         self.language_changed.emit(language)
 
     def set_minimap_enabled(self, enabled: bool):
@@ -210,7 +315,10 @@ class Monaco(QWebEngineView):
         Args:
             enabled (bool): True to enable the minimap, False to disable it.
         """
-        self._connector.send("update_editor_options", {"minimap": {"enabled": enabled}})
+        if self._minimap_enabled == enabled:
+            return
+        self._minimap_enabled = enabled
+        self._enqueue("update_editor_options", {"minimap": {"enabled": enabled}})
 
     def set_scroll_beyond_last_line_enabled(self, enabled: bool):
         """
@@ -219,7 +327,7 @@ class Monaco(QWebEngineView):
         Args:
             enabled (bool): True to enable scrolling beyond the last line, False to disable it.
         """
-        self._connector.send("update_editor_options", {"scrollBeyondLastLine": enabled})
+        self._enqueue("update_editor_options", {"scrollBeyondLastLine": enabled})
 
     def set_line_numbers_mode(self, mode: Literal["on", "off", "relative", "interval"]):
         """
@@ -228,19 +336,23 @@ class Monaco(QWebEngineView):
         Args:
             mode (Literal["on", "off", "relative", "interval"]): The line numbers mode to set.
         """
-        self._connector.send("update_editor_options", {"lineNumbers": mode})
+        self._enqueue("update_editor_options", {"lineNumbers": mode})
 
     def get_theme(self):
         return self._theme
 
     def set_theme(self, theme):
+        if self._theme == theme:
+            return
         self._theme = theme
-        self._connector.send("theme", theme)
+        self._enqueue("theme", theme)
         self.theme_changed.emit(theme)
 
     def set_readonly(self, read_only: bool):
         """Set the editor to read-only mode."""
-        self._connector.send("readonly", read_only)
+        if self._readonly == read_only:
+            return
+        self._enqueue("readonly", read_only)
         self._readonly = read_only
 
     def set_cursor(
@@ -257,9 +369,7 @@ class Monaco(QWebEngineView):
             column (int): Column number (1-based), defaults to 1.
             move_to_position (Literal[None, "center", "top", "position"], optional): Position to move the cursor to.
         """
-        self._connector.send(
-            "set_cursor", {"line": line, "column": column, "moveToPosition": move_to_position}
-        )
+        self._enqueue("set_cursor", (line, column, move_to_position))
 
     @property
     def current_cursor(self):
@@ -273,14 +383,14 @@ class Monaco(QWebEngineView):
             start_line (int): The starting line number (1-based).
             end_line (int): The ending line number (1-based).
         """
-        self._connector.send("highlight_lines", {"start": start_line, "end": end_line})
+        self._enqueue("highlight_lines", {"start": start_line, "end": end_line})
 
     def clear_highlighted_lines(self):
         """
         Clear any highlighted lines in the editor.
         This method sends a command to the JavaScript side to clear the highlights.
         """
-        self._connector.send("remove_highlight", {})
+        self._enqueue("remove_highlight", {})
 
     def set_vim_mode_enabled(self, enabled: bool):
         """
@@ -289,7 +399,10 @@ class Monaco(QWebEngineView):
         Args:
             enabled (bool): True to enable Vim mode, False to disable it.
         """
-        self._connector.send("vim_mode", enabled)
+        if self._vim_mode_enabled == enabled:
+            return
+        self._vim_mode_enabled = enabled
+        self._enqueue("vim_mode", enabled)
 
     def set_lsp_header(self, header: str):
         """
@@ -297,13 +410,16 @@ class Monaco(QWebEngineView):
         Args:
             header (str): The header text to prepend.
         """
-        if not isinstance(header, str):
-            raise TypeError("Header must be a string.")
+        if __debug__:
+            if not isinstance(header, str):
+                raise TypeError("Header must be a string.")
         header = header.strip()
         if not header.endswith("\n"):
             header += "\n"
+        if self._lsp_header == header:
+            return
         self._lsp_header = header
-        self._connector.send("set_lsp_header", header)
+        self._enqueue("set_lsp_header", header)
 
     def get_lsp_header(self) -> str:
         """
@@ -322,7 +438,7 @@ class Monaco(QWebEngineView):
             label (str): The label to display for the action.
             language (str): The programming language for the action.
         """
-        self._connector.send(
+        self._enqueue(
             "add_action",
             {"id": action_id, "label": label, "precondition": f"editorLangId == '{language}'"},
         )
@@ -342,9 +458,9 @@ class Monaco(QWebEngineView):
         if not isinstance(settings, dict):
             raise TypeError("Settings must be a dictionary.")
         if not self._initialized:
-            self._lsp_buffer.append(("update_workspace_config", settings))
+            self._lsp_buffer.append(("update_workspace_config", Connector.encode(settings)))
             return
-        self._connector.send("update_workspace_config", settings)
+        self._enqueue("update_workspace_config", settings)
 
 
 if __name__ == "__main__":
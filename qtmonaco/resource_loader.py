@@ -1,8 +1,10 @@
+import functools
 import os
 
 from qtpy.QtCore import QUrl
 
 
+@functools.lru_cache(maxsize=1)
 def get_monaco_html():
     """Get Monaco Editor HTML content from Qt resources."""
     with open(
@@ -11,6 +13,7 @@ def get_monaco_html():
         return file.read()
 
 
+@functools.lru_cache(maxsize=1)
 def get_monaco_base_url():
     """Get the base URL for Monaco Editor resources."""
     return QUrl.fromLocalFile(
@@ -1,7 +1,7 @@
 import pytest
 
 from qtmonaco.connector import Connector
-from qtmonaco.monaco import Monaco
+from qtmonaco.monaco import TEXT_CHUNK_SIZE, Monaco
 from qtmonaco.monaco_page import MonacoPage
 
 
@@ -15,16 +15,27 @@ def run_js_check(editor, qtbot, js_check, result, prefix_check="window.qtmonaco
         result (callable): A callback to handle the result of the JavaScript execution.
     """
     output = None
+    received = False
+    pending = False
 
     def js_callback(res):
-        nonlocal output
+        nonlocal output, received, pending
         output = res
-
-    editor.page().runJavaScript(prefix_check + js_check, js_callback)
-    qtbot.wait(100)
+        received = True
+        pending = False
+
+    def check():
+        # Re-run the check until the editor state matches, one request at a time
+        nonlocal pending
+        if received and output == result:
+            return True
+        if not pending:
+            pending = True
+            editor.page().runJavaScript(prefix_check + js_check, js_callback)
+        return False
 
     try:
-        qtbot.waitUntil(lambda: output == result)
+        qtbot.waitUntil(check)
     except Exception as e:
         # Log the error if the check fails
         raise TimeoutError(f"JavaScript check failed: {js_check} with error: {e}") from e
@@ -32,6 +43,19 @@ def run_js_check(editor, qtbot, js_check, result, prefix_check="window.qtmonaco
     return output
 
 
+def wait_for_bridge(editor, qtbot):
+    """
+    Wait until the bridge between Python and JavaScript is initialized.
+    Args:
+        editor (Monaco): The Monaco editor instance.
+        qtbot: The pytest-qt bot instance for handling asynchronous operations.
+    """
+    if editor.bridge_initialized:
+        return
+    with qtbot.waitSignal(editor.initialized, timeout=5000):
+        pass
+
+
 @pytest.fixture
 def monaco_editor(qtbot):
     editor = Monaco()
@@ -42,7 +66,7 @@ def monaco_editor(qtbot):
 
 def test_monaco_initialization(monaco_editor, qtbot):
     """Test that Monaco editor initializes correctly."""
-    qtbot.waitUntil(lambda: monaco_editor.bridge_initialized, timeout=5000)
+    wait_for_bridge(monaco_editor, qtbot)
     assert monaco_editor.bridge_initialized is True
     assert isinstance(monaco_editor.page(), MonacoPage)
     assert isinstance(monaco_editor._connector, Connector)
@@ -51,7 +75,7 @@ def test_monaco_initialization(monaco_editor, qtbot):
 @pytest.fixture
 def monaco_initialized(qtbot, monaco_editor):
     """Fixture to ensure Monaco editor is initialized."""
-    qtbot.waitUntil(lambda: monaco_editor.bridge_initialized, timeout=5000)
+    wait_for_bridge(monaco_editor, qtbot)
     assert monaco_editor.bridge_initialized is True
 
     # Ensure the Monaco editor is fully initialized
@@ -65,13 +89,11 @@ def test_monaco_vim_mode(monaco_initialized, qtbot):
     editor = monaco_initialized
     # Enable Vim mode
     editor.set_vim_mode_enabled(True)
-    qtbot.wait(100)  # Allow time for the change to propagate
 
     # Check if Vim mode is enabled
     run_js_check(editor, qtbot, "window.qtmonaco.vimMode !== null", True)
 
     editor.set_vim_mode_enabled(False)
-    qtbot.wait(100)  # Allow time for the change to propagate
 
     # Check if Vim mode is disabled
     run_js_check(editor, qtbot, "window.qtmonaco.vimMode !== null", False)
@@ -82,7 +104,6 @@ def test_monaco_readonly(monaco_initialized, qtbot):
     editor = monaco_initialized
     # Set the editor to readonly
     editor.set_readonly(True)
-    qtbot.wait(100)  # Allow time for the change to propagate
 
     # Check if the editor is readonly
     run_js_check(
@@ -94,7 +115,6 @@ def test_monaco_readonly(monaco_initialized, qtbot):
 
     # Set the editor to editable
     editor.set_readonly(False)
-    qtbot.wait(100)  # Allow time for the change to propagate
 
     # Check if the editor is editable
     run_js_check(
@@ -164,3 +184,119 @@ def test_monaco_insert_text(monaco_initialized, qtbot):
 
     # Check if the text is now "Line 1\nLine 2\nLine 3Start of line"
     assert editor.get_text() == "Line 1\nLine 2\nStart of line Line 3"
+
+
+def test_monaco_batches_updates(monaco_initialized, qtbot):
+    """Test that consecutive updates are sent to JavaScript as a single batch."""
+    editor = monaco_initialized
+    sent = []
+    editor._connector.javascript_data_sent.connect(lambda name, value: sent.append(name))
+
+    editor.set_minimap_enabled(False)
+    editor.set_line_numbers_mode("off")
+    editor.set_text("batched text")
+    qtbot.wait(100)  # Allow time for the batch to be flushed
+
+    assert sent == ["_batch"]
+    run_js_check(editor, qtbot, "window.qtmonaco.editor.getValue()", "batched text")
+
+
+def test_monaco_unserializable_value_raises_at_caller(monaco_initialized, qtbot):
+    """Test that unserializable values raise immediately without dropping other queued updates."""
+    editor = monaco_initialized
+    editor.set_text("kept text")
+
+    with pytest.raises(TypeError):
+        editor.update_workspace_configuration({"pylsp": object()})
+
+    run_js_check(editor, qtbot, "window.qtmonaco.editor.getValue()", "kept text")
+
+
+def test_monaco_unchanged_setters_do_not_send(monaco_initialized, qtbot):
+    """Test that setters called with the current value do not send anything to JavaScript."""
+    editor = monaco_initialized
+    sent = []
+    editor._connector.javascript_data_sent.connect(lambda name, value: sent.append(name))
+
+    editor.set_readonly(False)
+    editor.set_vim_mode_enabled(False)
+    editor.set_minimap_enabled(True)
+    qtbot.wait(100)
+
+    assert sent == []
+
+
+def test_monaco_lsp_starts_for_default_editor(monaco_initialized, qtbot):
+    """Test that the PyLSP server is started for an editor using the default Python language."""
+    assert monaco_initialized.pylsp_host is not None
+
+
+def test_monaco_lsp_not_started_for_other_languages(qtbot):
+    """Test that the PyLSP server is only started once a non-Python editor switches to Python."""
+    editor = Monaco()
+    editor.set_language("javascript")
+    qtbot.addWidget(editor)
+    qtbot.waitExposed(editor)
+    wait_for_bridge(editor, qtbot)
+    assert editor.pylsp_host is None
+
+    # Without an LSP client, configuration updates are answered with a failure
+    with qtbot.waitSignal(editor.workspace_config_updated) as blocker:
+        editor.update_workspace_configuration({"pylsp": {"plugins": {}}})
+    assert blocker.args == [False, "LSP client not initialized"]
+
+    editor.set_language("python")
+    assert editor.pylsp_host is not None
+
+
+def test_monaco_set_large_text(monaco_initialized, qtbot):
+    """Test that documents larger than the chunk size are transferred completely."""
+    editor = monaco_initialized
+    text = "\n".join(f"line {i}" for i in range(20000))
+    assert len(text) > TEXT_CHUNK_SIZE
+
+    editor.set_text(text)
+
+    run_js_check(editor, qtbot, "window.qtmonaco.editor.getValue().length", len(text))
+    run_js_check(editor, qtbot, "window.qtmonaco.editor.getValue().endsWith('line 19999')", True)
+
+
+def test_monaco_language_follows_set_text(monaco_initialized, qtbot):
+    """Test that a language passed to set_text is tracked, so set_language can switch back."""
+    editor = monaco_initialized
+    editor.set_language("python")
+    editor.set_text("const x = 1;", language="javascript")
+    assert editor.get_language() == "javascript"
+
+    editor.set_language("python")
+    run_js_check(editor, qtbot, "window.qtmonaco.editor.getModel().getLanguageId()", "python")
+    assert editor.get_language() == "python"
+
+
+def test_connector_serializes_non_str_keys_and_unicode(qtbot):
+    """Test that the connector accepts non-string dict keys and non-ASCII text."""
+    connector = Connector()
+    connector.set_initialized()
+
+    with qtbot.waitSignal(connector.javascript_data_sent) as blocker:
+        connector.send("update_workspace_config", {"settings": {1: "äöü 🐍"}})
+    assert blocker.args == ["update_workspace_config", '{"settings":{"1":"äöü 🐍"}}']
+
+
+def test_connector_falls_back_to_json(qtbot):
+    """Test that values rejected by orjson are still encoded like json.dumps does."""
+    connector = Connector()
+    connector.set_initialized()
+
+    with qtbot.waitSignal(connector.javascript_data_sent) as blocker:
+        connector.send("set_text", {"data": "\udcff", "line": 2**70})
+    assert blocker.args == ["set_text", '{"data": "\\udcff", "line": 1180591620717411303424}']
+
+
+def test_monaco_set_unicode_text(monaco_initialized, qtbot):
+    """Test that non-ASCII text is transferred to the editor unchanged."""
+    editor = monaco_initialized
+    text = "äöü – 日本語 🐍"
+    editor.set_text(text)
+
+    run_js_check(editor, qtbot, "window.qtmonaco.editor.getValue()", text)